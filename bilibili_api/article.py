@@ -4,19 +4,24 @@ bilibili_api.article
 专栏相关
 """
 
-import re
 import json
-from copy import copy
+import time
+import asyncio
+from copy import deepcopy
 from enum import Enum
 from html import unescape
 from datetime import datetime
 from urllib.parse import unquote
-from typing import List, Union, TypeVar, overload
+from typing import List, Union, TypeVar
 
 import yaml
 import httpx
-from yarl import URL
-from bs4 import BeautifulSoup, element
+from bs4 import BeautifulSoup, SoupStrainer, element
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 from .utils.initial_state import get_initial_state, get_initial_state_sync
 from .utils.utils import get_api, raise_for_statement
@@ -30,6 +35,11 @@ from . import opus
 
 API = get_api("article")
 
+# get_all() 最多缓存的专栏数，超出后丢弃最久未使用的
+_ALL_DATA_CACHE_SIZE = 32
+# get_all() 缓存的有效时间（秒）
+_ALL_DATA_CACHE_TTL = 60
+
 # 文章颜色表
 ARTICLE_COLOR_MAP = {
     "default": "222222",
@@ -96,6 +106,111 @@ class ArticleRankingType(Enum):
 ArticleT = TypeVar("ArticleT", bound="Article")
 
 
+_CONTENT_STRAINER = SoupStrainer("div")
+
+
+class _SoupDom:
+    """
+    基于 BeautifulSoup + lxml 的节点访问方式，未安装 selectolax 时使用
+    """
+
+    @staticmethod
+    def load(content: str) -> element.Tag:
+        # 只保留包裹正文的 div，不再为 html / body 等外层结构建树
+        soup = BeautifulSoup(
+            f"<div>{content}</div>", "lxml", parse_only=_CONTENT_STRAINER
+        )
+        return soup.find("div")  # type: ignore
+
+    @staticmethod
+    def children(el: element.Tag):
+        return el.contents
+
+    @staticmethod
+    def is_text(el) -> bool:
+        return type(el) == element.NavigableString
+
+    @staticmethod
+    def is_element(el) -> bool:
+        # 注释、CDATA 等 NavigableString 子类不是标签
+        return isinstance(el, element.Tag)
+
+    @staticmethod
+    def tag(el: element.Tag) -> str:
+        return el.name
+
+    @staticmethod
+    def attrs(el: element.Tag) -> dict:
+        return el.attrs
+
+    @staticmethod
+    def classes(el: element.Tag) -> List[str]:
+        return el.attrs.get("class", [])
+
+    @staticmethod
+    def text(el) -> str:
+        if isinstance(el, element.NavigableString):
+            return str(el)
+        return el.text
+
+    @staticmethod
+    def find(el: element.Tag, name: str):
+        return el.find(name)
+
+    @staticmethod
+    def first_child(el: element.Tag):
+        return el.contents[0] if el.contents else None
+
+
+class _LexborDom:
+    """
+    基于 selectolax (lexbor) 的节点访问方式，速度与内存占用均远优于 BeautifulSoup
+    """
+
+    @staticmethod
+    def load(content: str):
+        return LexborHTMLParser(f"<div>{content}</div>").body.child  # type: ignore
+
+    @staticmethod
+    def children(el):
+        return el.iter(include_text=True)
+
+    @staticmethod
+    def is_text(el) -> bool:
+        return el.tag == "-text"
+
+    @staticmethod
+    def is_element(el) -> bool:
+        # 注释等特殊节点的 tag 以 "-" 开头
+        return not el.tag.startswith("-")
+
+    @staticmethod
+    def tag(el) -> str:
+        return el.tag
+
+    @staticmethod
+    def attrs(el) -> dict:
+        return el.attributes
+
+    @staticmethod
+    def classes(el) -> List[str]:
+        return (el.attributes.get("class") or "").split()
+
+    @staticmethod
+    def text(el) -> str:
+        if el.tag == "-text":
+            return el.text(deep=False)
+        return el.text()
+
+    @staticmethod
+    def find(el, name: str):
+        return el.css_first(name)
+
+    @staticmethod
+    def first_child(el):
+        return el.child
+
+
 async def get_article_rank(
     rank_type: ArticleRankingType = ArticleRankingType.YESTERDAY,
 ):
@@ -113,6 +228,99 @@ async def get_article_rank(
     return await Api(**api).update_params(**params).result
 
 
+def clear_article_cache(cvid: Union[int, None] = None) -> None:
+    """
+    清除 `Article.get_all()` 缓存的专栏数据
+
+    Args:
+        cvid (int | None, optional): cv 号，为 None 时清除全部. Defaults to None.
+    """
+    if cvid is None:
+        cache_pool.article_all_data.clear()
+    else:
+        cache_pool.article_all_data.pop(cvid, None)
+
+
+def _parse_style(style: str) -> dict:
+    """
+    将 style 属性解析为字典，只解析一次，避免逐个子串查找
+    """
+    return {
+        k.strip(): v.strip()
+        for k, v in (kv.split(":", 1) for kv in style.split(";") if ":" in kv)
+    }
+
+
+def _full_url(url: str) -> str:
+    """
+    为缺少协议头的链接（如 //i0.hdslb.com/...）补上 https:
+    """
+    if url.startswith("//"):
+        return "https:" + url
+    return url
+
+
+# 卡片处理函数，aid 为 img 标签上的 aid 属性
+
+
+def _add_video_cards(aid: str, node_list: list) -> None:
+    # 视频卡片，考虑有两列视频
+    for a in aid.split(","):
+        node = VideoCardNode()
+        node.aid = int(a)
+        node_list.append(node)
+
+
+def _add_article_card(aid: str, node_list: list) -> None:
+    node = ArticleCardNode()
+    node.cvid = int(aid)
+    node_list.append(node)
+
+
+def _add_bangumi_card(aid: str, node_list: list) -> None:
+    node = BangumiCardNode()
+    node.epid = int(aid[2:])
+    node_list.append(node)
+
+
+def _add_music_card(aid: str, node_list: list) -> None:
+    node = MusicCardNode()
+    node.auid = int(aid[2:])
+    node_list.append(node)
+
+
+def _add_shop_card(aid: str, node_list: list) -> None:
+    node = ShopCardNode()
+    node.pwid = int(aid[2:])
+    node_list.append(node)
+
+
+def _add_comic_cards(aid: str, node_list: list) -> None:
+    # 漫画卡片，考虑有两列
+    for i in aid.split(","):
+        node = ComicCardNode()
+        node.mcid = int(i)
+        node_list.append(node)
+
+
+def _add_live_card(aid: str, node_list: list) -> None:
+    node = LiveCardNode()
+    node.room_id = int(aid)
+    node_list.append(node)
+
+
+# img 标签 class -> 卡片处理函数
+_FIGURE_CARD_DISPATCH = {
+    "video-card": _add_video_cards,
+    "article-card": _add_article_card,
+    "fanju-card": _add_bangumi_card,
+    "music-card": _add_music_card,
+    "shop-card": _add_shop_card,
+    "caricature-card": _add_comic_cards,
+    "live-card": _add_live_card,
+}
+
+
 class ArticleList:
     """
     文集类
@@ -191,10 +399,17 @@ class Article:
         if cache_pool.article_dyn_id.get(self.__cvid):
             self.__dyn_id = cache_pool.article_dyn_id[self.__cvid]
         else:
-            initial_state = get_initial_state_sync(
-                f"https://www.bilibili.com/read/cv{self.__cvid}"
-            )
-            self.__dyn_id = int(initial_state[0]["readInfo"]["dyn_id_str"])
+            # dyn_id 不会变化，缓存过期与否都可以直接使用
+            cached = cache_pool.article_all_data.get(self.__cvid)
+            if cached is not None:
+                all_data = cached[1]
+            else:
+                all_data = get_initial_state_sync(
+                    f"https://www.bilibili.com/read/cv{self.__cvid}"
+                )[0]
+            self.__dyn_id = int(all_data["readInfo"]["dyn_id_str"])
+            # 只记下 dyn_id，完整数据仅在 get_all() 中缓存
+            cache_pool.article_dyn_id[self.__cvid] = self.__dyn_id
 
     def get_cvid(self) -> int:
         return self.__cvid
@@ -254,7 +469,7 @@ class Article:
         if not self.__has_parsed:
             raise ApiException("请先调用 fetch_content()")
 
-        content = ""
+        parts = []
 
         for node in self.__children:
             try:
@@ -262,11 +477,11 @@ class Article:
             except:
                 continue
             else:
-                content += markdown_text
+                parts.append(markdown_text)
 
         meta_yaml = yaml.safe_dump(self.__meta, allow_unicode=True)
-        content = f"---\n{meta_yaml}\n---\n\n{content}"
-        return content
+        content = "".join(parts)
+        return f"---\n{meta_yaml}\n---\n\n{content}"
 
     def json(self) -> dict:
         """
@@ -283,7 +498,7 @@ class Article:
         return {
             "type": "Article",
             "meta": self.__meta,
-            "children": list(map(lambda x: x.json(), self.__children)),
+            "children": [node.json() for node in self.__children],
         }
 
     async def fetch_content(self) -> None:
@@ -295,261 +510,250 @@ class Article:
 
         resp = await self.get_all()
 
-        document = BeautifulSoup(f"<div>{resp['readInfo']['content']}</div>", "lxml")
-
-        async def parse(el: BeautifulSoup):
-            node_list = []
-
-            for e in el.contents:  # type: ignore
-                if type(e) == element.NavigableString:
-                    # 文本节点
-                    node = TextNode(e)  # type: ignore
-                    node_list.append(node)
-                    continue
-
-                e: BeautifulSoup = e
-                if e.name == "p":
-                    # 段落
-                    node = ParagraphNode()
-                    node_list.append(node)
-
-                    if "style" in e.attrs:
-                        if "text-align: center" in e.attrs["style"]:
-                            node.align = "center"
-
-                        elif "text-align: right" in e.attrs["style"]:
-                            node.align = "right"
+        # 重新获取时丢弃旧节点（连同其导出缓存）
+        self.__children = []
 
-                        else:
-                            node.align = "left"
+        dom = _LexborDom if LexborHTMLParser is not None else _SoupDom
+        document = dom.load(resp["readInfo"]["content"])
 
-                    node.children = await parse(e)
+        # 待解析的站内链接，(所在列表, 占位下标, 链接)
+        anchor_jobs = []
 
-                elif e.name == "h1":
-                    # 标题
-                    node = HeadingNode()
-                    node_list.append(node)
+        def parse(root) -> list:
+            result = []
+            # 以显式栈代替递归，(待遍历元素, 子节点写入的列表)
+            stack = [(root, result)]
 
-                    node.children = await parse(e)
+            while stack:
+                el, node_list = stack.pop()
 
-                elif e.name == "strong":
-                    # 粗体
-                    node = BoldNode()
-                    node_list.append(node)
+                for e in dom.children(el):
+                    if dom.is_text(e):
+                        # 文本节点
+                        node = TextNode(dom.text(e))
+                        node_list.append(node)
+                        continue
 
-                    node.children = await parse(e)
+                    if not dom.is_element(e):
+                        # 注释等非标签节点
+                        continue
 
-                elif e.name == "span":
-                    # 各种样式
-                    if "style" in e.attrs:
-                        style = e.attrs["style"]
+                    tag = dom.tag(e)
+                    attrs = dom.attrs(e)
+                    if tag == "p":
+                        # 段落
+                        node = ParagraphNode()
+                        node_list.append(node)
 
-                        if "text-decoration: line-through" in style:
-                            # 删除线
-                            node = DelNode()
-                            node_list.append(node)
+                        if "style" in attrs:
+                            align = _parse_style(attrs["style"]).get("text-align")
+                            node.align = (
+                                align if align in ("center", "right") else "left"
+                            )
 
-                            node.children = await parse(e)
+                        stack.append((e, node.children))
 
-                    elif "class" in e.attrs:
-                        className = e.attrs["class"][0]
+                    elif tag == "h1":
+                        # 标题
+                        node = HeadingNode()
+                        node_list.append(node)
 
-                        if "font-size" in className:
-                            # 字体大小
-                            node = FontSizeNode()
-                            node_list.append(node)
+                        stack.append((e, node.children))
 
-                            node.size = int(re.search("font-size-(\d\d)", className)[1])  # type: ignore
-                            node.children = await parse(e)
+                    elif tag == "strong":
+                        # 粗体
+                        node = BoldNode()
+                        node_list.append(node)
 
-                        elif "color" in className:
-                            # 字体颜色
-                            node = ColorNode()
-                            node_list.append(node)
+                        stack.append((e, node.children))
 
-                            color_text = re.search("color-(.*);?", className)[1]  # type: ignore
-                            node.color = ARTICLE_COLOR_MAP[color_text]
+                    elif tag == "span":
+                        # 各种样式
+                        if "style" in attrs:
+                            style = _parse_style(attrs["style"])
 
-                            node.children = await parse(e)
-                        else:
-                            if e.text != "":
-                                # print(e.text.replace("\n", ""))
-                                # print()
-                                node = TextNode(e.text)
-                                # print("Add a text node: ", e.text)
+                            if "line-through" in style.get("text-decoration", ""):
+                                # 删除线
+                                node = DelNode()
                                 node_list.append(node)
-                                node.children = parse(e)  # type: ignore
-
-                elif e.name == "blockquote":
-                    # 引用块
-                    # print(e.text)
-                    node = BlockquoteNode()
-                    node_list.append(node)
-                    node.children = await parse(e)
-
-                elif e.name == "figure":
-                    if "class" in e.attrs:
-                        className = e.attrs["class"]
-
-                        if "img-box" in className:
-                            img_el: BeautifulSoup = e.find("img")  # type: ignore
-                            if img_el == None:
-                                pass
-                            elif "class" in img_el.attrs:
-                                className = img_el.attrs["class"]
-
-                                if "cut-off" in className:
-                                    # 分割线
-                                    node = SeparatorNode()
-                                    node_list.append(node)
-
-                                if "aid" in img_el.attrs:
-                                    # 各种卡片
-                                    aid = img_el.attrs["aid"]
-
-                                    if "video-card" in className:
-                                        # 视频卡片，考虑有两列视频
-                                        for a in aid.split(","):
-                                            node = VideoCardNode()
-                                            node_list.append(node)
 
-                                            node.aid = int(a)
+                                stack.append((e, node.children))
 
-                                    elif "article-card" in className:
-                                        # 文章卡片
-                                        node = ArticleCardNode()
-                                        node_list.append(node)
+                        elif "class" in attrs:
+                            className = dom.classes(e)[0]
 
-                                        node.cvid = int(aid)
+                            if className.startswith("font-size-"):
+                                # 字体大小，形如 font-size-20
+                                node = FontSizeNode()
+                                node_list.append(node)
 
-                                    elif "fanju-card" in className:
-                                        # 番剧卡片
-                                        node = BangumiCardNode()
-                                        node_list.append(node)
+                                node.size = int(className[10:12])
+                                stack.append((e, node.children))
 
-                                        node.epid = int(aid[2:])
+                            elif className.startswith("color-"):
+                                # 字体颜色，形如 color-blue-01
+                                node = ColorNode()
+                                node_list.append(node)
 
-                                    elif "music-card" in className:
-                                        # 音乐卡片
-                                        node = MusicCardNode()
-                                        node_list.append(node)
+                                node.color = ARTICLE_COLOR_MAP.get(
+                                    className[6:].rstrip(";"),
+                                    ARTICLE_COLOR_MAP["default"],
+                                )
 
-                                        node.auid = int(aid[2:])
+                                stack.append((e, node.children))
+                            else:
+                                text = dom.text(e)
+                                if text != "":
+                                    node = TextNode(text)
+                                    node_list.append(node)
 
-                                    elif "shop-card" in className:
-                                        # 会员购卡片
-                                        node = ShopCardNode()
+                    elif tag == "blockquote":
+                        # 引用块
+                        node = BlockquoteNode()
+                        node_list.append(node)
+                        stack.append((e, node.children))
+
+                    elif tag == "figure":
+                        if "class" in attrs:
+                            className = dom.classes(e)
+
+                            if "img-box" in className:
+                                img_el = dom.find(e, "img")
+                                if img_el == None:
+                                    pass
+                                elif "class" in dom.attrs(img_el):
+                                    img_attrs = dom.attrs(img_el)
+                                    className = dom.classes(img_el)
+
+                                    if "cut-off" in className:
+                                        # 分割线
+                                        node = SeparatorNode()
                                         node_list.append(node)
 
-                                        node.pwid = int(aid[2:])
-
-                                    elif "caricature-card" in className:
-                                        # 漫画卡片，考虑有两列
+                                    if "aid" in img_attrs:
+                                        # 各种卡片
+                                        for cls in className:
+                                            handler = _FIGURE_CARD_DISPATCH.get(cls)
+                                            if handler is not None:
+                                                handler(img_attrs["aid"], node_list)
+                                                break
+                                else:
+                                    # 图片节点
+                                    node = ImageNode()
+                                    node_list.append(node)
 
-                                        for i in aid.split(","):
-                                            node = ComicCardNode()
-                                            node_list.append(node)
+                                    node.url = _full_url(dom.attrs(img_el)["data-src"])
 
-                                            node.mcid = int(i)
+                                    figcaption_el = dom.find(e, "figcaption")
 
-                                    elif "live-card" in className:
-                                        # 直播卡片
-                                        node = LiveCardNode()
-                                        node_list.append(node)
+                                    if figcaption_el:
+                                        first = dom.first_child(figcaption_el)
+                                        if first is not None:
+                                            node.alt = dom.text(first)
 
-                                        node.room_id = int(aid)
-                            else:
-                                # 图片节点
-                                node = ImageNode()
+                            elif "code-box" in className:
+                                # 代码块
+                                node = CodeNode()
                                 node_list.append(node)
 
-                                node.url = "https:" + e.find("img").attrs["data-src"]  # type: ignore
+                                pre_el = dom.find(e, "pre")
+                                pre_attrs = dom.attrs(pre_el)
+                                node.lang = pre_attrs["data-lang"].split("@")[0].lower()
+                                node.code = unquote(pre_attrs["codecontent"])
 
-                                figcaption_el: BeautifulSoup = e.find("figcaption")  # type: ignore
-
-                                if figcaption_el:
-                                    if figcaption_el.contents:
-                                        node.alt = figcaption_el.contents[0]  # type: ignore
-
-                        elif "code-box" in className:
-                            # 代码块
-                            node = CodeNode()
-                            node_list.append(node)
-
-                            pre_el: BeautifulSoup = e.find("pre")  # type: ignore
-                            node.lang = pre_el.attrs["data-lang"].split("@")[0].lower()
-                            node.code = unquote(pre_el.attrs["codecontent"])
-
-                elif e.name == "ol":
-                    # 有序列表
-                    node = OlNode()
-                    node_list.append(node)
-
-                    node.children = await parse(e)
-
-                elif e.name == "li":
-                    # 列表元素
-                    node = LiNode()
-                    node_list.append(node)
+                    elif tag == "ol":
+                        # 有序列表
+                        node = OlNode()
+                        node_list.append(node)
 
-                    node.children = await parse(e)
+                        stack.append((e, node.children))
 
-                elif e.name == "ul":
-                    # 无序列表
-                    node = UlNode()
-                    node_list.append(node)
+                    elif tag == "li":
+                        # 列表元素
+                        node = LiNode()
+                        node_list.append(node)
 
-                    node.children = await parse(e)
+                        stack.append((e, node.children))
 
-                elif e.name == "a":
-                    # 超链接
-                    if len(e.contents) == 0:
-                        from .utils.parse_link import ResourceType, parse_link
+                    elif tag == "ul":
+                        # 无序列表
+                        node = UlNode()
+                        node_list.append(node)
 
-                        parse_link_res = await parse_link(e.attrs["href"])
-                        if parse_link_res[1] == ResourceType.VIDEO:
-                            node = VideoCardNode()
-                            node.aid = parse_link_res[0].get_aid()
-                            node_list.append(node)
-                        elif parse_link_res[1] == ResourceType.AUDIO:
-                            node = MusicCardNode()
-                            node.auid = parse_link_res[0].get_auid()
-                            node_list.append(node)
-                        elif parse_link_res[1] == ResourceType.LIVE:
-                            node = LiveCardNode()
-                            node.room_id = parse_link_res[0].room_display_id
-                            node_list.append(node)
-                        elif parse_link_res[1] == ResourceType.ARTICLE:
-                            node = ArticleCardNode()
-                            node.cvid = parse_link_res[0].get_cvid()
-                            node_list.append(node)
+                        stack.append((e, node.children))
+
+                    elif tag == "a":
+                        # 超链接
+                        first = dom.first_child(e)
+                        if first is None:
+                            # 站内链接卡片，需异步解析，先占位
+                            anchor_jobs.append(
+                                (node_list, len(node_list), attrs["href"])
+                            )
+                            node_list.append(None)
                         else:
-                            # XXX: 暂不支持其他的站内链接
-                            pass
-                    else:
-                        node = AnchorNode()
-                        node_list.append(node)
+                            node = AnchorNode()
+                            node_list.append(node)
 
-                        node.url = e.attrs["href"]
-                        node.text = e.contents[0]  # type: ignore
+                            node.url = attrs["href"]
+                            node.text = dom.text(first)
 
-                elif e.name == "img":
-                    className = e.attrs.get("class")
+                    elif tag == "img":
+                        className = dom.classes(e)
 
-                    if not className:
-                        # 图片
-                        node = ImageNode()
-                        node.url = e.attrs.get("data-src")  # type: ignore
-                        node_list.append(node)
+                        if not className:
+                            # 图片
+                            node = ImageNode()
+                            node.url = _full_url(attrs.get("data-src") or "")
+                            node_list.append(node)
 
-                    elif "latex" in className:
-                        # 公式
-                        node = LatexNode()
-                        node_list.append(node)
+                        elif "latex" in className:
+                            # 公式
+                            node = LatexNode()
+                            node_list.append(node)
 
-                        node.code = unquote(e["alt"])  # type: ignore
+                            node.code = unquote(attrs["alt"])  # type: ignore
+
+            return result
+
+        async def resolve_anchors() -> None:
+            from .utils.parse_link import ResourceType, parse_link
+
+            # 同一篇专栏内的相同链接只解析一次，且并发解析
+            hrefs = list({href: None for _, _, href in anchor_jobs})
+            # 限制同时进行的请求数，避免触发风控 (412)
+            semaphore = asyncio.Semaphore(10)
+
+            async def resolve(href: str):
+                async with semaphore:
+                    return await parse_link(href)
+
+            results = await asyncio.gather(*(resolve(href) for href in hrefs))
+            link_res = dict(zip(hrefs, results))
+
+            for node_list, index, href in anchor_jobs:
+                parse_link_res = link_res[href]
+                node = None
+                if parse_link_res[1] == ResourceType.VIDEO:
+                    node = VideoCardNode()
+                    node.aid = parse_link_res[0].get_aid()
+                elif parse_link_res[1] == ResourceType.AUDIO:
+                    node = MusicCardNode()
+                    node.auid = parse_link_res[0].get_auid()
+                elif parse_link_res[1] == ResourceType.LIVE:
+                    node = LiveCardNode()
+                    node.room_id = parse_link_res[0].room_display_id
+                elif parse_link_res[1] == ResourceType.ARTICLE:
+                    node = ArticleCardNode()
+                    node.cvid = parse_link_res[0].get_cvid()
+                else:
+                    # XXX: 暂不支持其他的站内链接
+                    pass
+                node_list[index] = node
 
-            return node_list
+            # 去掉无法解析的占位
+            for node_list in {id(l): l for l, _, _ in anchor_jobs}.values():
+                node_list[:] = [node for node in node_list if node is not None]
 
         def parse_note(data: List[dict]):
             for field in data:
@@ -562,15 +766,15 @@ class Article:
                         self.__children.append(node)
                     elif "imageUpload" in field["insert"].keys():
                         node = ImageNode()
-                        node.url = field["insert"]["imageUpload"]["url"]
+                        node.url = _full_url(field["insert"]["imageUpload"]["url"])
                         self.__children.append(node)
                     elif "cut-off" in field["insert"].keys():
                         node = ImageNode()
-                        node.url = field["insert"]["cut-off"]["url"]
+                        node.url = _full_url(field["insert"]["cut-off"]["url"])
                         self.__children.append(node)
                     elif "native-image" in field["insert"].keys():
                         node = ImageNode()
-                        node.url = field["insert"]["native-image"]["url"]
+                        node.url = _full_url(field["insert"]["native-image"]["url"])
                         self.__children.append(node)
                     else:
                         raise Exception()
@@ -607,12 +811,12 @@ class Article:
                     self.__children.append(node)
 
         # 文章元数据
-        self.__meta = copy(resp["readInfo"])
-        del self.__meta["content"]
+        self.__meta = {k: v for k, v in resp["readInfo"].items() if k != "content"}
 
         # 解析正文
         if self.__type != ArticleType.SPECIAL_ARTICLE:
-            self.__children = await parse(document.find("div"))  # type: ignore
+            self.__children = parse(document)
+            await resolve_anchors()
         else:
             s = resp["readInfo"]["content"]
             s = unescape(s)
@@ -638,12 +842,32 @@ class Article:
         """
         一次性获取专栏尽可能详细数据，包括原始内容、标签、发布时间、标题、相关专栏推荐等
 
+        结果按 cvid 缓存 60 秒（最多保留最近使用的 32 篇），可通过 `clear_article_cache()` 清除
+
         Returns:
             dict: 调用 API 返回的结果
         """
-        return (
-            await get_initial_state(f"https://www.bilibili.com/read/cv{self.__cvid}")
-        )[0]
+        cache = cache_pool.article_all_data
+        now = time.monotonic()
+        hit = cache.pop(self.__cvid, None)
+        if hit is not None and hit[0] > now:
+            expires, all_data = hit
+        else:
+            all_data = (
+                await get_initial_state(
+                    f"https://www.bilibili.com/read/cv{self.__cvid}"
+                )
+            )[0]
+            expires = time.monotonic() + _ALL_DATA_CACHE_TTL
+            if len(cache) >= _ALL_DATA_CACHE_SIZE:
+                for expired in [k for k, v in cache.items() if v[0] <= now]:
+                    del cache[expired]
+            while len(cache) >= _ALL_DATA_CACHE_SIZE:
+                del cache[next(iter(cache))]
+        # 重新插入到末尾，字典顺序即最近使用顺序
+        cache[self.__cvid] = (expires, all_data)
+        # 返回副本，调用方修改结果不会影响缓存
+        return deepcopy(all_data)
 
     async def set_like(self, status: bool = True) -> dict:
         """
@@ -697,382 +921,386 @@ class Article:
     # TODO: 专栏上传/编辑/删除
 
 
+def _evaluate(root: "Node", emitters: dict, cache_attr: Union[str, None] = None):
+    """
+    以显式栈后序遍历节点树，子节点结果算出后交给 emitters 中对应类型的函数生成当前节点的结果。
+
+    提供 cache_attr 时结果缓存在节点的该属性上，已有缓存的子树不再遍历。
+    结果为可变对象时不要缓存，否则调用方修改返回值会影响之后的结果。
+    """
+    out = []
+    work = [(root, False)]
+
+    while work:
+        node, visited = work.pop()
+        children = getattr(node, "children", ())
+
+        if visited:
+            start = len(out) - len(children)
+            result = emitters[type(node)](node, out[start:])
+            del out[start:]
+            if cache_attr is not None:
+                setattr(node, cache_attr, result)
+            out.append(result)
+            continue
+
+        if cache_attr is not None:
+            cached = getattr(node, cache_attr)
+            if cached is not None:
+                out.append(cached)
+                continue
+
+        work.append((node, True))
+        for child in reversed(children):
+            work.append((child, False))
+
+    return out[0]
+
+
 class Node:
+    __slots__ = ("_md_cache",)
+
     def __init__(self):
-        pass
+        self._md_cache = None
 
-    @overload
-    def markdown(self) -> str:  # type: ignore
-        pass
+    def markdown(self) -> str:
+        return _evaluate(self, _MD_EMITTERS, "_md_cache")
 
-    @overload
-    def json(self) -> dict:  # type: ignore
-        pass
+    def json(self) -> dict:
+        # JSON 结果为可变的 dict / list，每次重新生成，避免调用方修改后影响下次导出
+        return _evaluate(self, _JSON_EMITTERS)
 
 
 class ParagraphNode(Node):
+    __slots__ = ("children", "align")
+
     def __init__(self):
+        super().__init__()
         self.children = []
         self.align = "left"
 
-    def markdown(self):
-        content = "".join([node.markdown() for node in self.children])
-        return content + "\n\n"
-
-    def json(self):
-        return {
-            "type": "ParagraphNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class HeadingNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        text = "".join([node.markdown() for node in self.children])
-        if len(text) == 0:
-            return ""
-        return f"## {text}\n\n"
-
-    def json(self):
-        return {
-            "type": "HeadingNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class BlockquoteNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        t = "".join([node.markdown() for node in self.children])
-        # 填补空白行的 > 并加上标识符
-        t = "\n".join(["> " + line for line in t.split("\n")]) + "\n\n"
-
-        return t
-
-    def json(self):
-        return {
-            "type": "BlockquoteNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class ItalicNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        text = "".join([node.markdown() for node in self.children])
-        if len(text) == 0:
-            return ""
-        return f" *{text}* "
-
-    def json(self):
-        return {
-            "type": "ItalicNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class BoldNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        t = "".join([node.markdown() for node in self.children])
-        if len(t) == 0:
-            return ""
-        return f" **{t.lstrip().rstrip()}** "
-
-    def json(self):
-        return {
-            "type": "BoldNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class DelNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        text = "".join([node.markdown() for node in self.children])
-        if len(text) == 0:
-            return ""
-        return f" ~~{text}~~ "
-
-    def json(self):
-        return {
-            "type": "DelNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class UnderlineNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        text = "".join([node.markdown() for node in self.children])
-        if len(text) == 0:
-            return ""
-        return " $\\underline{" + text + "}$ "
-
-    def json(self):
-        return {
-            "type": "UnderlineNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class UlNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        return "\n".join(["- " + node.markdown() for node in self.children])
-
-    def json(self):
-        return {
-            "type": "UlNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class OlNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        t = []
-        for i, node in enumerate(self.children):
-            t.append(f"{i + 1}. {node.markdown()}")
-        return "\n".join(t)
-
-    def json(self):
-        return {
-            "type": "OlNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class LiNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
+        super().__init__()
         self.children = []
 
-    def markdown(self):
-        return "".join([node.markdown() for node in self.children])
-
-    def json(self):
-        return {
-            "type": "LiNode",
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class ColorNode(Node):
+    __slots__ = ("color", "children")
+
     def __init__(self):
+        super().__init__()
         self.color = "000000"
         self.children = []
 
-    def markdown(self):
-        return "".join([node.markdown() for node in self.children])
-
-    def json(self):
-        return {
-            "type": "ColorNode",
-            "color": self.color,
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
-
 
 class FontSizeNode(Node):
+    __slots__ = ("size", "children")
+
     def __init__(self):
+        super().__init__()
         self.size = 16
         self.children = []
 
-    def markdown(self):
-        return "".join([node.markdown() for node in self.children])
 
-    def json(self):
-        return {
-            "type": "FontSizeNode",
-            "size": self.size,
-            "children": list(map(lambda x: x.json(), self.children)),
-        }
+# 特殊节点，即无子节点
 
+# TextNode 转义规则，空白转为 &emsp;，Markdown 特殊字符前加 \\
+# 反斜杠须最先处理。逐个 str.replace 在 C 层查找，比多字符映射的 str.translate 快数倍
+_TEXT_ESCAPES = (
+    ("\\", "\\\\"),
+    ("\t", "&emsp;"),
+    (" ", "&emsp;"),
+    (chr(160), "&emsp;"),
+    *((c, "\\" + c) for c in "*$<>|~_"),
+)
 
-# 特殊节点，即无子节点
+
+def _escape_text(text: str) -> str:
+    for old, new in _TEXT_ESCAPES:
+        if old in text:
+            text = text.replace(old, new)
+    return text
 
 
 class TextNode(Node):
+    __slots__ = ("text",)
+
     def __init__(self, text: str):
+        super().__init__()
         self.text = text
 
-    def markdown(self):
-        txt = self.text
-        txt = txt.replace("\t", " ")
-        txt = txt.replace(" ", "&emsp;")
-        txt = txt.replace(chr(160), "&emsp;")
-        special_chars = ["\\", "*", "$", "<", ">", "|"]
-        for c in special_chars:
-            txt = txt.replace(c, "\\" + c)
-        return txt
-
-    def json(self):
-        return {"type": "TextNode", "text": self.text}
-
 
 class ImageNode(Node):
+    __slots__ = ("url", "alt")
+
     def __init__(self):
+        super().__init__()
         self.url = ""
         self.alt = ""
 
-    def markdown(self):
-        if URL(self.url).scheme == "":
-            self.url = "https:" + self.url
-        alt = self.alt.replace("[", "\\[")
-        return f"![{alt}]({self.url})\n\n"
-
-    def json(self):
-        if URL(self.url).scheme == "":
-            self.url = "https:" + self.url
-        return {"type": "ImageNode", "url": self.url, "alt": self.alt}
-
 
 class LatexNode(Node):
+    __slots__ = ("code",)
+
     def __init__(self):
+        super().__init__()
         self.code = ""
 
-    def markdown(self):
-        if "\n" in self.code:
-            # 块级公式
-            return f"$$\n{self.code}\n$$"
-        else:
-            # 行内公式
-            return f"${self.code}$"
-
-    def json(self):
-        return {"type": "LatexNode", "code": self.code}
-
 
 class CodeNode(Node):
+    __slots__ = ("code", "lang")
+
     def __init__(self):
+        super().__init__()
         self.code = ""
         self.lang = ""
 
-    def markdown(self):
-        return f"```{self.lang if self.lang else ''}\n{self.code}\n```\n\n"
-
-    def json(self):
-        return {"type": "CodeNode", "code": self.code, "lang": self.lang}
-
 
 # 卡片
 
 
 class VideoCardNode(Node):
+    __slots__ = ("aid",)
+
     def __init__(self):
+        super().__init__()
         self.aid = 0
 
-    def markdown(self):
-        return f"[视频 av{self.aid}](https://www.bilibili.com/av{self.aid})\n\n"
-
-    def json(self):
-        return {"type": "VideoCardNode", "aid": self.aid}
-
 
 class ArticleCardNode(Node):
+    __slots__ = ("cvid",)
+
     def __init__(self):
+        super().__init__()
         self.cvid = 0
 
-    def markdown(self):
-        return f"[文章 cv{self.cvid}](https://www.bilibili.com/read/cv{self.cvid})\n\n"
-
-    def json(self):
-        return {"type": "ArticleCardNode", "cvid": self.cvid}
-
 
 class BangumiCardNode(Node):
+    __slots__ = ("epid",)
+
     def __init__(self):
+        super().__init__()
         self.epid = 0
 
-    def markdown(self):
-        return f"[番剧 ep{self.epid}](https://www.bilibili.com/bangumi/play/ep{self.epid})\n\n"
-
-    def json(self):
-        return {"type": "BangumiCardNode", "epid": self.epid}
-
 
 class MusicCardNode(Node):
+    __slots__ = ("auid",)
+
     def __init__(self):
+        super().__init__()
         self.auid = 0
 
-    def markdown(self):
-        return f"[音乐 au{self.auid}](https://www.bilibili.com/audio/au{self.auid})\n\n"
-
-    def json(self):
-        return {"type": "MusicCardNode", "auid": self.auid}
-
 
 class ShopCardNode(Node):
+    __slots__ = ("pwid",)
+
     def __init__(self):
+        super().__init__()
         self.pwid = 0
 
-    def markdown(self):
-        return f"[会员购 {self.pwid}](https://show.bilibili.com/platform/detail.html?id={self.pwid})\n\n"
-
-    def json(self):
-        return {"type": "ShopCardNode", "pwid": self.pwid}
-
 
 class ComicCardNode(Node):
+    __slots__ = ("mcid",)
+
     def __init__(self):
+        super().__init__()
         self.mcid = 0
 
-    def markdown(self):
-        return (
-            f"[漫画 mc{self.mcid}](https://manga.bilibili.com/m/detail/mc{self.mcid})\n\n"
-        )
-
-    def json(self):
-        return {"type": "ComicCardNode", "mcid": self.mcid}
-
 
 class LiveCardNode(Node):
+    __slots__ = ("room_id",)
+
     def __init__(self):
+        super().__init__()
         self.room_id = 0
 
-    def markdown(self):
-        return f"[直播 {self.room_id}](https://live.bilibili.com/{self.room_id})\n\n"
-
-    def json(self):
-        return {"type": "LiveCardNode", "room_id": self.room_id}
-
 
 class AnchorNode(Node):
+    __slots__ = ("url", "text")
+
     def __init__(self):
+        super().__init__()
         self.url = ""
         self.text = ""
 
-    def markdown(self):
-        text = self.text.replace("[", "\\[")
-        return f"[{text}]({self.url})"
-
-    def json(self):
-        return {"type": "AnchorNode", "url": self.url, "text": self.text}
-
 
 class SeparatorNode(Node):
+    __slots__ = ()
+
     def __init__(self):
-        pass
+        super().__init__()
+
 
-    def markdown(self):
-        return "\n------\n"
+# 各类节点的 Markdown 生成函数，参数为 (节点, 子节点 Markdown 列表)
 
-    def json(self):
-        return {"type": "SeparatorNode"}
+
+def _md_wrap(prefix: str, suffix: str):
+    # 子节点内容非空时加上前后缀
+    def emit(node: Node, children: List[str]) -> str:
+        text = "".join(children)
+        if len(text) == 0:
+            return ""
+        return prefix + text + suffix
+
+    return emit
+
+
+def _md_bold(node: BoldNode, children: List[str]) -> str:
+    t = "".join(children)
+    if len(t) == 0:
+        return ""
+    return f" **{t.strip()}** "
+
+
+def _md_blockquote(node: BlockquoteNode, children: List[str]) -> str:
+    t = "".join(children)
+    if len(t) == 0:
+        return ""
+    # 填补空白行的 > 并加上标识符
+    return "> " + t.replace("\n", "\n> ") + "\n\n"
+
+
+def _md_image(node: ImageNode, children: List[str]) -> str:
+    alt = node.alt.replace("[", "\\[")
+    return f"![{alt}]({node.url})\n\n"
+
+
+def _md_latex(node: LatexNode, children: List[str]) -> str:
+    if "\n" in node.code:
+        # 块级公式
+        return f"$$\n{node.code}\n$$"
+    else:
+        # 行内公式
+        return f"${node.code}$"
+
+
+def _md_anchor(node: AnchorNode, children: List[str]) -> str:
+    text = node.text.replace("[", "\\[")
+    return f"[{text}]({node.url})"
+
+
+_MD_EMITTERS = {
+    ParagraphNode: lambda n, c: "".join(c) + "\n\n",
+    HeadingNode: _md_wrap("## ", "\n\n"),
+    BlockquoteNode: _md_blockquote,
+    ItalicNode: _md_wrap(" *", "* "),
+    BoldNode: _md_bold,
+    DelNode: _md_wrap(" ~~", "~~ "),
+    UnderlineNode: _md_wrap(" $\\underline{", "}$ "),
+    UlNode: lambda n, c: "\n".join(["- " + t for t in c]),
+    OlNode: lambda n, c: "\n".join([f"{i}. {t}" for i, t in enumerate(c, 1)]),
+    LiNode: lambda n, c: "".join(c),
+    ColorNode: lambda n, c: "".join(c),
+    FontSizeNode: lambda n, c: "".join(c),
+    TextNode: lambda n, c: _escape_text(n.text),
+    ImageNode: _md_image,
+    LatexNode: _md_latex,
+    CodeNode: lambda n, c: f"```{n.lang or ''}\n{n.code}\n```\n\n",
+    VideoCardNode: lambda n, c: f"[视频 av{n.aid}](https://www.bilibili.com/av{n.aid})\n\n",
+    ArticleCardNode: lambda n, c: f"[文章 cv{n.cvid}](https://www.bilibili.com/read/cv{n.cvid})\n\n",
+    BangumiCardNode: lambda n, c: f"[番剧 ep{n.epid}](https://www.bilibili.com/bangumi/play/ep{n.epid})\n\n",
+    MusicCardNode: lambda n, c: f"[音乐 au{n.auid}](https://www.bilibili.com/audio/au{n.auid})\n\n",
+    ShopCardNode: lambda n, c: f"[会员购 {n.pwid}](https://show.bilibili.com/platform/detail.html?id={n.pwid})\n\n",
+    ComicCardNode: lambda n, c: f"[漫画 mc{n.mcid}](https://manga.bilibili.com/m/detail/mc{n.mcid})\n\n",
+    LiveCardNode: lambda n, c: f"[直播 {n.room_id}](https://live.bilibili.com/{n.room_id})\n\n",
+    AnchorNode: _md_anchor,
+    SeparatorNode: lambda n, c: "\n------\n",
+}
+
+
+# 各类节点的 JSON 生成函数，参数为 (节点, 子节点 JSON 列表)
+_JSON_EMITTERS = {
+    ParagraphNode: lambda n, c: {"type": "ParagraphNode", "children": c},
+    HeadingNode: lambda n, c: {"type": "HeadingNode", "children": c},
+    BlockquoteNode: lambda n, c: {"type": "BlockquoteNode", "children": c},
+    ItalicNode: lambda n, c: {"type": "ItalicNode", "children": c},
+    BoldNode: lambda n, c: {"type": "BoldNode", "children": c},
+    DelNode: lambda n, c: {"type": "DelNode", "children": c},
+    UnderlineNode: lambda n, c: {"type": "UnderlineNode", "children": c},
+    UlNode: lambda n, c: {"type": "UlNode", "children": c},
+    OlNode: lambda n, c: {"type": "OlNode", "children": c},
+    LiNode: lambda n, c: {"type": "LiNode", "children": c},
+    ColorNode: lambda n, c: {"type": "ColorNode", "color": n.color, "children": c},
+    FontSizeNode: lambda n, c: {"type": "FontSizeNode", "size": n.size, "children": c},
+    TextNode: lambda n, c: {"type": "TextNode", "text": n.text},
+    ImageNode: lambda n, c: {"type": "ImageNode", "url": n.url, "alt": n.alt},
+    LatexNode: lambda n, c: {"type": "LatexNode", "code": n.code},
+    CodeNode: lambda n, c: {"type": "CodeNode", "code": n.code, "lang": n.lang},
+    VideoCardNode: lambda n, c: {"type": "VideoCardNode", "aid": n.aid},
+    ArticleCardNode: lambda n, c: {"type": "ArticleCardNode", "cvid": n.cvid},
+    BangumiCardNode: lambda n, c: {"type": "BangumiCardNode", "epid": n.epid},
+    MusicCardNode: lambda n, c: {"type": "MusicCardNode", "auid": n.auid},
+    ShopCardNode: lambda n, c: {"type": "ShopCardNode", "pwid": n.pwid},
+    ComicCardNode: lambda n, c: {"type": "ComicCardNode", "mcid": n.mcid},
+    LiveCardNode: lambda n, c: {"type": "LiveCardNode", "room_id": n.room_id},
+    AnchorNode: lambda n, c: {"type": "AnchorNode", "url": n.url, "text": n.text},
+    SeparatorNode: lambda n, c: {"type": "SeparatorNode"},
+}
@@ -999,14 +999,11 @@ async def get_dynamic_page_info(
         "page": pn,
     }
     params.update({"offset": offset} if offset else {})
+    # 未传入的参数不会出现在 update_params 的参数中，无需从共享的 api 中删除
     if _type:  # 全部动态
         params["type"] = _type.value
     elif host_mid:  # 指定 UP 主动态
         params["host_mid"] = host_mid
-    elif not _type:
-        api["params"].pop("type")
-    elif not host_mid:
-        api["params"].pop("host_mid")
 
     dynmaic_data = (
         await Api(**api, credential=credential).update_params(**params).result
@@ -6,16 +6,69 @@ bilibili_api.music
 注意: 目前 B 站的音频并不和 B 站的音乐相关信息互通。这里的 Music 类的数据来源于视频下面的 bgm 标签和全站音乐榜中的每一个 bgm/音乐。get_homepage_recommend 和 get_music_index_info 来源于 https://www.bilibili.com/v/musicplus/
 """
 
+import time
+import asyncio
+import inspect
+from copy import deepcopy
 from enum import Enum
-from typing import Optional
+from functools import wraps
+from urllib.parse import quote
+from typing import Any, Dict, List, Tuple, Union, Optional, AsyncGenerator
 
 from .utils.utils import get_api
+from .exceptions import ArgsException
 from .utils.credential import Credential
 from .utils.network import Api
 
 API_audio = get_api("audio")
 API = get_api("music")
 
+_HOMEPAGE_RECOMMEND_API = API_audio["audio_info"]["homepage_recommend"]
+_AUDIO_LIST_API = API_audio["audio_info"]["audio_list"]
+
+
+def _ttl_cache(ttl: float, maxsize: int = 128):
+    """
+    为协程函数添加带过期时间的结果缓存，以参数值为键，缓存字典可通过 `.cache` 访问
+
+    每次返回的都是缓存结果的副本，调用方修改返回值不会影响缓存
+
+    Args:
+        ttl     (float): 缓存有效时间（秒）
+
+        maxsize (int)  : 最多缓存的条目数. Defaults to 128.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache: Dict[tuple, Tuple[float, Any]] = {}
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(
+                arg.value if isinstance(arg, Enum) else arg
+                for arg in bound.arguments.values()
+            )
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and hit[0] > now:
+                return deepcopy(hit[1])
+            result = await func(*args, **kwargs)
+            if key not in cache and len(cache) >= maxsize:
+                for expired in [k for k, v in cache.items() if v[0] <= now]:
+                    del cache[expired]
+                if len(cache) >= maxsize:
+                    del cache[next(iter(cache))]
+            cache[key] = (now + ttl, result)
+            return deepcopy(result)
+
+        wrapper.cache = cache  # type: ignore
+        return wrapper
+
+    return decorator
+
 
 class MusicOrder(Enum):
     """
@@ -29,6 +82,45 @@ class MusicOrder(Enum):
     HOT = 2
 
 
+class _IndexTag(Enum):
+    """
+    音乐索引标签枚举基类
+    """
+
+    @classmethod
+    def from_value(cls, value: Union[int, str]) -> Optional["_IndexTag"]:
+        """
+        根据标签值获取对应的标签，用于转换 API 返回的标签 id
+
+        Args:
+            value (int | str): 标签值
+
+        Returns:
+            该类的成员，找不到时返回 None
+        """
+        return cls._value2member_map_.get(value)  # type: ignore
+
+    @classmethod
+    def values(cls) -> Tuple[Union[int, str], ...]:
+        """
+        获取所有标签值
+
+        Returns:
+            Tuple[int | str, ...]: 按定义顺序排列的标签值
+        """
+        return cls._values  # type: ignore
+
+    @classmethod
+    def choices(cls) -> Tuple[Tuple[Union[int, str], str], ...]:
+        """
+        获取所有标签的 (标签值, 名称) 对，可直接用于选择列表
+
+        Returns:
+            Tuple[Tuple[int | str, str], ...]: 按定义顺序排列的 (标签值, 名称)
+        """
+        return cls._choices  # type: ignore
+
+
 class MusicIndexTags:
     """
     音乐索引信息查找可以用的标签，有语言和类型两种标签，每种标签选一个
@@ -37,7 +129,7 @@ class MusicIndexTags:
     - Genre: 类型标签枚举类
     """
 
-    class Lang(Enum):
+    class Lang(_IndexTag):
         """
         - ALL: 全部
         - CHINESE: 华语
@@ -54,7 +146,7 @@ class MusicIndexTags:
         KOREA = 61
         OTHER = 1
 
-    class Genre(Enum):
+    class Genre(_IndexTag):
         """
         - ALL: 全部
         - POPULAR: 流行
@@ -106,6 +198,31 @@ class MusicIndexTags:
         OTHER = 23
 
 
+# 标签及标签值到请求参数值的映射，既可以传入标签也可以直接传入标签值
+_ORDER_COERCE = {
+    key: order.value for order in MusicOrder for key in (order, order.value)
+}
+_LANG_COERCE = {
+    key: lang.value for lang in MusicIndexTags.Lang for key in (lang, lang.value)
+}
+_GENRE_COERCE = {
+    key: genre.value for genre in MusicIndexTags.Genre for key in (genre, genre.value)
+}
+
+MusicIndexTags.Lang._values = tuple(  # type: ignore
+    lang.value for lang in MusicIndexTags.Lang
+)
+MusicIndexTags.Lang._choices = tuple(  # type: ignore
+    (lang.value, lang.name) for lang in MusicIndexTags.Lang
+)
+MusicIndexTags.Genre._values = tuple(  # type: ignore
+    genre.value for genre in MusicIndexTags.Genre
+)
+MusicIndexTags.Genre._choices = tuple(  # type: ignore
+    (genre.value, genre.name) for genre in MusicIndexTags.Genre
+)
+
+
 async def get_homepage_recommend(credential: Optional[Credential] = None):
     """
     获取音频首页推荐
@@ -117,44 +234,182 @@ async def get_homepage_recommend(credential: Optional[Credential] = None):
         dict: 调用 API 返回的结果
     """
     credential = credential if credential else Credential()
-    api = API_audio["audio_info"]["homepage_recommend"]
-    return await Api(**api, credential=credential).result
-
-
+    return await Api(**_HOMEPAGE_RECOMMEND_API, credential=credential).result
+
+
+# 音乐视频列表的请求链接模板，按 (排序, 语言, 类型) 预先拼好，每次只需填入关键词和页码
+# 接口文件中的链接自带示例参数，这里去掉后自行拼接，请求时不再传入 params
+_AUDIO_LIST_URL = _AUDIO_LIST_API["url"].split("?")[0]
+_AUDIO_LIST_REQUEST = {
+    k: v for k, v in _AUDIO_LIST_API.items() if k not in ("url", "params")
+}
+_INDEX_URL_TEMPLATES = {
+    (order.value, lang.value, genre.value): (
+        f"{_AUDIO_LIST_URL}?type={order.value}&genre={genre.value}&lang={lang.value}"
+        "&keyword={keyword}&pn={pn}&ps={ps}"
+    )
+    for order in MusicOrder
+    for lang in MusicIndexTags.Lang
+    for genre in MusicIndexTags.Genre
+}
+
+# get_music_index_info 全部使用默认参数时的请求链接
+_DEFAULT_INDEX_ARGS = (
+    "",
+    MusicIndexTags.Lang.ALL,
+    MusicIndexTags.Genre.ALL,
+    MusicOrder.NEW,
+    1,
+    10,
+)
+_DEFAULT_INDEX_URL = _INDEX_URL_TEMPLATES[
+    (
+        MusicOrder.NEW.value,
+        MusicIndexTags.Lang.ALL.value,
+        MusicIndexTags.Genre.ALL.value,
+    )
+].format(keyword="", pn=1, ps=10)
+
+
+@_ttl_cache(60)
 async def get_music_index_info(
     keyword: str = "",
-    lang: MusicIndexTags.Lang = MusicIndexTags.Lang.ALL,
-    genre: MusicIndexTags.Genre = MusicIndexTags.Genre.ALL,
-    order: MusicOrder = MusicOrder.NEW,
+    lang: Union[MusicIndexTags.Lang, int, str] = MusicIndexTags.Lang.ALL,
+    genre: Union[MusicIndexTags.Genre, int, str] = MusicIndexTags.Genre.ALL,
+    order: Union[MusicOrder, int] = MusicOrder.NEW,
     page_num: int = 1,
     page_size: int = 10,
 ) -> dict:
     """
     获取首页的音乐视频列表
 
+    相同参数的结果会缓存 60 秒，可通过 `get_music_index_info.cache.clear()` 清除
+
+    Args:
+        keyword   (str)                        : 关键词. Defaults to None.
+
+        lang      (MusicIndexTags.Lang | int)  : 语言，也可以直接传入标签值. Defaults to MusicIndexTags.Lang.ALL
+
+        genre     (MusicIndexTags.Genre | int) : 类型，也可以直接传入标签值. Defaults to MusicIndexTags.Genre.ALL
+
+        order     (MusicOrder | int)           : 排序方式，也可以直接传入排序值. Defaults to OrderAudio.NEW
+
+        page_num  (int)                        : 页码. Defaults to 1.
+
+        page_size (int)                        : 每页的数据大小. Defaults to 10.
+    """
+    if (keyword, lang, genre, order, page_num, page_size) == _DEFAULT_INDEX_ARGS:
+        url = _DEFAULT_INDEX_URL
+    else:
+        try:
+            template = _INDEX_URL_TEMPLATES[
+                (_ORDER_COERCE[order], _LANG_COERCE[lang], _GENRE_COERCE[genre])
+            ]
+        except KeyError as e:
+            raise ArgsException(f"不支持的标签或排序方式: {e.args[0]!r}")
+        # 与 Api 处理 params 时一致，None 视为不传
+        url = template.format(
+            keyword="" if keyword is None else quote(str(keyword), safe=""),
+            pn=page_num,
+            ps=page_size,
+        )
+    return await Api(url=url, **_AUDIO_LIST_REQUEST).result
+
+
+async def get_music_index_info_pages(
+    keyword: str = "",
+    lang: Union[MusicIndexTags.Lang, int, str] = MusicIndexTags.Lang.ALL,
+    genre: Union[MusicIndexTags.Genre, int, str] = MusicIndexTags.Genre.ALL,
+    order: Union[MusicOrder, int] = MusicOrder.NEW,
+    start_page: int = 1,
+    end_page: int = 1,
+    page_size: int = 10,
+) -> List[dict]:
+    """
+    并发获取首页的音乐视频列表的多页数据
+
+    Args:
+        keyword    (str)                        : 关键词. Defaults to None.
+
+        lang       (MusicIndexTags.Lang | int)  : 语言，也可以直接传入标签值. Defaults to MusicIndexTags.Lang.ALL
+
+        genre      (MusicIndexTags.Genre | int) : 类型，也可以直接传入标签值. Defaults to MusicIndexTags.Genre.ALL
+
+        order      (MusicOrder | int)           : 排序方式，也可以直接传入排序值. Defaults to OrderAudio.NEW
+
+        start_page (int)                        : 起始页码. Defaults to 1.
+
+        end_page   (int)                        : 结束页码（包含）. Defaults to 1.
+
+        page_size  (int)                        : 每页的数据大小. Defaults to 10.
+
+    Returns:
+        List[dict]: 每一页调用 API 返回的结果，按页码顺序排列
+    """
+    # 限制同时进行的请求数，避免触发风控 (412)
+    semaphore = asyncio.Semaphore(10)
+
+    async def fetch(page_num: int) -> dict:
+        async with semaphore:
+            return await get_music_index_info(
+                keyword, lang, genre, order, page_num, page_size
+            )
+
+    return list(
+        await asyncio.gather(
+            *(fetch(page_num) for page_num in range(start_page, end_page + 1))
+        )
+    )
+
+
+async def iter_music_index(
+    keyword: str = "",
+    lang: Union[MusicIndexTags.Lang, int, str] = MusicIndexTags.Lang.ALL,
+    genre: Union[MusicIndexTags.Genre, int, str] = MusicIndexTags.Genre.ALL,
+    order: Union[MusicOrder, int] = MusicOrder.NEW,
+    start_page: int = 1,
+    end_page: int = 1,
+    page_size: int = 10,
+) -> AsyncGenerator[dict, None]:
+    """
+    逐页获取首页的音乐视频列表，处理当前页的同时会预先请求下一页
+
     Args:
-        keyword   (str)                 : 关键词. Defaults to None.
+        keyword    (str)                        : 关键词. Defaults to None.
 
-        lang      (MusicIndexTags.Lang) : 语言. Defaults to MusicIndexTags.Lang.ALL
+        lang       (MusicIndexTags.Lang | int)  : 语言，也可以直接传入标签值. Defaults to MusicIndexTags.Lang.ALL
 
-        genre     (MusicIndexTags.Genre): 类型. Defaults to MusicIndexTags.Genre.ALL
+        genre      (MusicIndexTags.Genre | int) : 类型，也可以直接传入标签值. Defaults to MusicIndexTags.Genre.ALL
 
-        order     (MusicOrder)          : 排序方式. Defaults to OrderAudio.NEW
+        order      (MusicOrder | int)           : 排序方式，也可以直接传入排序值. Defaults to OrderAudio.NEW
 
-        page_num  (int)                 : 页码. Defaults to 1.
+        start_page (int)                        : 起始页码. Defaults to 1.
 
-        page_size (int)                 : 每页的数据大小. Defaults to 10.
+        end_page   (int)                        : 结束页码（包含）. Defaults to 1.
+
+        page_size  (int)                        : 每页的数据大小. Defaults to 10.
+
+    Returns:
+        AsyncGenerator[dict, None]: 按页码顺序产出每一页调用 API 返回的结果
     """
-    api = API_audio["audio_info"]["audio_list"]
-    params = {
-        "type": order.value,
-        "lang": lang.value,
-        "genre": genre.value,
-        "keyword": keyword,
-        "pn": page_num,
-        "ps": page_size,
-    }
-    return await Api(**api).update_params(**params).result
+
+    def fetch(page_num: int) -> asyncio.Task:
+        return asyncio.create_task(
+            get_music_index_info(keyword, lang, genre, order, page_num, page_size)
+        )
+
+    page_num = start_page
+    next_task = fetch(page_num) if page_num <= end_page else None
+    try:
+        while next_task is not None:
+            page = await next_task
+            page_num += 1
+            next_task = fetch(page_num) if page_num <= end_page else None
+            yield page
+    finally:
+        # 提前停止迭代时取消已发出的预取请求
+        if next_task is not None:
+            next_task.cancel()
 
 
 class Music:
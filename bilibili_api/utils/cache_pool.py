@@ -1,5 +1,6 @@
 article_is_opus = {}
 article_dyn_id = {}
+article_all_data = {}
 dynamic_is_opus = {}
 opus_type = {}
 opus_info = {}
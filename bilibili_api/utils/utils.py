@@ -7,35 +7,50 @@ bilibili_api.utils.utils
 import json
 import os
 import random
+from functools import lru_cache
 from typing import List, TypeVar
 from ..exceptions import StatementException
 
 
-def get_api(field: str, *args) -> dict:
+@lru_cache(maxsize=None)
+def _load_api(field: str) -> dict:
     """
-    获取 API。
+    读取并解析 data/api 下的 API 文件，每个文件只解析一次。
 
     Args:
-        field (str): API 所属分类，即 data/api 下的文件名（不含后缀名）
+        field (str): API 所属分类（小写）
 
     Returns:
-        dict, 该 API 的内容。
+        dict, 该文件的内容，文件不存在时为空字典。
     """
     path = os.path.abspath(
-        os.path.join(
-            os.path.dirname(__file__), "..", "data", "api", f"{field.lower()}.json"
-        )
+        os.path.join(os.path.dirname(__file__), "..", "data", "api", f"{field}.json")
     )
     if os.path.exists(path):
         with open(path, encoding="utf8") as f:
-            data = json.load(f)
-            for arg in args:
-                data = data[arg]
-            return data
+            return json.load(f)
     else:
         return {}
 
 
+def get_api(field: str, *args) -> dict:
+    """
+    获取 API。
+
+    注意：返回的字典在各模块间共享，请勿修改。
+
+    Args:
+        field (str): API 所属分类，即 data/api 下的文件名（不含后缀名）
+
+    Returns:
+        dict, 该 API 的内容。
+    """
+    data = _load_api(field.lower())
+    for arg in args:
+        data = data[arg]
+    return data
+
+
 def crack_uid(crc32: str):
     """
     弹幕中的 CRC32 ID 转换成用户 UID。
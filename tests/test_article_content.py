@@ -0,0 +1,83 @@
+# bilibili_api.article 正文解析（离线，不请求网络）
+from bilibili_api import article
+from bilibili_api.utils.credential import Credential
+
+CONTENT = (
+    '<p style="text-align: center;">居中<strong>粗体</strong></p>'
+    '<p style="text-align:right">右对齐</p>'
+    "<!-- 顶层注释 -->"
+    "<h1>标题</h1>"
+    "<p>"
+    '<span class="color-blue-01">蓝色</span>'
+    '<span class="color-unknown-99">未知颜色</span>'
+    '<span class="font-size-20">大字</span>'
+    '<span style="text-decoration: line-through;">删除线</span>'
+    "</p>"
+    '<figure class="img-box"><img data-src="//i0.hdslb.com/a.png">'
+    "<figcaption>图片说明</figcaption></figure>"
+    '<figure class="img-box"><img class="cut-off" data-src="//x"></figure>'
+    '<figure class="img-box"><img class="video-card" aid="1,2" data-src="//x"></figure>'
+    '<figure class="img-box"><img class="article-card" aid="3" data-src="//x"></figure>'
+    '<figure class="img-box"><img class="fanju-card" aid="ep4" data-src="//x"></figure>'
+    '<figure class="img-box"><img class="music-card" aid="au5" data-src="//x"></figure>'
+    '<figure class="img-box"><img class="shop-card" aid="pw6" data-src="//x"></figure>'
+    '<figure class="img-box"><img class="caricature-card" aid="7,8" data-src="//x"></figure>'
+    '<figure class="img-box"><img class="live-card" aid="9" data-src="//x"></figure>'
+    '<figure class="code-box"><pre data-lang="Python@1" '
+    'codecontent="print(%22a%26amp%3Bb%22)"></pre></figure>'
+    "<blockquote><p>引用<!-- 内部注释 --></p></blockquote>"
+    "<ol><li>一</li></ol><ul><li>二</li></ul>"
+)
+
+
+def make_article(content: str, title: str = "标题") -> article.Article:
+    # 跳过 __init__ 中的网络请求，直接用给定的正文构造专栏
+    ar = article.Article.__new__(article.Article)
+    ar.credential = Credential()
+    ar._Article__cvid = 1
+    ar._Article__type = article.ArticleType.ARTICLE
+    ar._Article__children = []
+    ar._Article__meta = None
+    ar._Article__has_parsed = False
+
+    async def get_all():
+        return {"readInfo": {"content": content, "title": title}}
+
+    ar.get_all = get_all
+    return ar
+
+
+async def parse_with(lexbor, content: str = CONTENT, title: str = "标题"):
+    saved = article.LexborHTMLParser
+    article.LexborHTMLParser = lexbor
+    try:
+        ar = make_article(content, title)
+        await ar.fetch_content()
+    finally:
+        article.LexborHTMLParser = saved
+    return ar
+
+
+async def test_a_Article_fetch_content_backends_same():
+    soup = await parse_with(None)
+    md = soup.markdown()
+    assert "## 标题" in md, md
+    assert '```python\nprint("a&amp;b")\n```' in md, md
+    assert "注释" not in md, md
+
+    if article.LexborHTMLParser is None:
+        # 未安装 selectolax，只检查 BeautifulSoup 的结果
+        return md
+
+    lexbor = await parse_with(article.LexborHTMLParser)
+    assert lexbor.markdown() == md
+    assert lexbor.json() == soup.json()
+    return md
+
+
+async def test_b_Article_markdown_emoji_title():
+    # 非 BMP 字符（如 emoji）应原样写入 YAML 头
+    ar = await parse_with(None, "<p>x</p>", "标题 🎉 测试")
+    md = ar.markdown()
+    assert "title: 标题 🎉 测试\n" in md, md
+    return md
@@ -0,0 +1,47 @@
+# bilibili_api.music
+
+from bilibili_api import music
+from bilibili_api.exceptions import ArgsException
+
+
+async def test_a_get_music_index_info_pages():
+    pages = await music.get_music_index_info_pages(start_page=1, end_page=2)
+    assert len(pages) == 2, pages
+    return pages
+
+
+async def test_b_iter_music_index():
+    pages = [page async for page in music.iter_music_index(start_page=1, end_page=2)]
+    assert len(pages) == 2, pages
+    return pages
+
+
+async def test_c_get_music_index_info_raw_order():
+    # 直接传入排序值与传入 MusicOrder 等价
+    hot = await music.get_music_index_info(order=music.MusicOrder.HOT)
+    raw = await music.get_music_index_info(order=2)
+    assert raw == hot
+    return raw
+
+
+async def test_d_get_music_index_info_unknown_order():
+    try:
+        await music.get_music_index_info(order=5)
+    except ArgsException as e:
+        return str(e)
+    raise AssertionError("order=5 应抛出 ArgsException")
+
+
+async def test_e_MusicIndexTags_from_value():
+    assert music.MusicIndexTags.Genre.from_value(23) is music.MusicIndexTags.Genre.OTHER
+    assert music.MusicIndexTags.Lang.from_value("x") is None
+    return music.MusicIndexTags.Lang.from_value("")
+
+
+async def test_f_MusicIndexTags_values_choices():
+    Lang = music.MusicIndexTags.Lang
+    assert Lang.values()[0] == ""
+    assert Lang.values() == tuple(lang.value for lang in Lang)
+    assert Lang.choices() == tuple((lang.value, lang.name) for lang in Lang)
+    assert music.MusicIndexTags.Genre.choices()[-1] == (23, "OTHER")
+    return Lang.choices()